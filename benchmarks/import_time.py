@@ -0,0 +1,71 @@
+"""Import-time benchmark for the non-chart entry points.
+
+Runs each import in a fresh interpreter and fails if the best-of-N wall time
+exceeds the budget, or if matplotlib/numpy were loaded along the way.
+
+    python benchmarks/import_time.py [--budget 0.5] [--repeat 5]
+"""
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+ENTRY_POINTS = [
+    "import trade_analysis",
+    "import trade_analysis.charts",
+    "from trade_analysis import ingress, processing, hypothesis_testing, results_store",
+]
+
+FORBIDDEN_MODULES = ["matplotlib", "numpy"]
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+exec({stmt!r})
+elapsed = time.perf_counter() - start
+loaded = [m for m in {forbidden!r} if m in sys.modules]
+print(json.dumps({{"elapsed": elapsed, "loaded": loaded}}))
+"""
+
+
+def _measure(stmt: str) -> dict:
+    code = _PROBE.format(stmt=stmt, forbidden=FORBIDDEN_MODULES)
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--budget", type=float, default=0.5, help="seconds per entry point")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    failed = False
+    for stmt in ENTRY_POINTS:
+        runs = [_measure(stmt) for _ in range(args.repeat)]
+        best = min(r["elapsed"] for r in runs)
+        loaded = sorted({m for r in runs for m in r["loaded"]})
+
+        problems = []
+        if best > args.budget:
+            problems.append(f"over budget ({args.budget:.3f}s)")
+        if loaded:
+            problems.append(f"loaded {', '.join(loaded)}")
+        failed |= bool(problems)
+
+        print(f"{best:.3f}s\t{'; '.join(problems) or 'ok'}\t{stmt}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,25 @@
+import importlib
+
+# Submodules are imported on first attribute access, so pulling in the
+# package does not drag matplotlib in through trade_analysis.charts.
+_SUBMODULES = {
+    "charts",
+    "hypothesis_testing",
+    "ingress",
+    "processing",
+    "results_store",
+}
+
+__all__ = sorted(_SUBMODULES)
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        module = importlib.import_module(f"{__name__}.{name}")
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | _SUBMODULES)
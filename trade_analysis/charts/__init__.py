@@ -0,0 +1,32 @@
+import importlib
+
+# Chart modules import matplotlib, which is slow to load; resolve them and
+# their plot functions only when a chart is actually requested.
+_SUBMODULES = {"bar", "hhi", "pie", "share", "trends"}
+
+_FUNCTIONS = {
+    "plot_bar": "bar",
+    "plot_hhi_over_time": "hhi",
+    "plot_pie": "pie",
+    "plot_share_over_time": "share",
+    "plot_segmented_trend": "trends",
+    "plot_hypothesis_summary": "trends",
+}
+
+__all__ = sorted(_SUBMODULES | set(_FUNCTIONS))
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        value = importlib.import_module(f"{__name__}.{name}")
+    elif name in _FUNCTIONS:
+        module = importlib.import_module(f"{__name__}.{_FUNCTIONS[name]}")
+        value = getattr(module, name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
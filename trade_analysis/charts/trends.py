@@ -1,38 +1,64 @@
-import numpy as np
+from typing import Optional
+
 import polars as pl
 import matplotlib.pyplot as plt
 
+from trade_analysis.hypothesis_testing import fit_segmented_trends
+
+
+def _segment_line(fit: pl.DataFrame, segment: str):
+    rows = fit.filter((pl.col("segment") == segment) & pl.col("slope").is_not_null())
+    if len(rows) == 0:
+        return None
+    return rows["time_period"].to_list(), rows["fitted"].to_list(), rows["slope"][0], rows["intercept"][0]
+
 
 def plot_segmented_trend(
-    years: list,
-    values: list,
-    cutoff_year: int,
+    years: Optional[list] = None,
+    values: Optional[list] = None,
+    cutoff_year: Optional[int] = None,
     title: str = "",
     ylabel: str = "",
     print_data: bool = False,
+    fit: Optional[pl.DataFrame] = None,
 ) -> None:
-    before_y = [y for y in years if y < cutoff_year]
-    before_v = [v for y, v in zip(years, values) if y < cutoff_year]
-    after_y = [y for y in years if y >= cutoff_year]
-    after_v = [v for y, v in zip(years, values) if y >= cutoff_year]
-
-    coeffs_before = None
-    coeffs_after = None
+    # `fit` is one series/cutoff slice of fit_segmented_trends(); without it
+    # the lines are fitted here from `years` and `values`.
+    if fit is None:
+        if years is None or values is None or cutoff_year is None:
+            raise ValueError("years, values and cutoff_year are required when fit is not given")
+        fit = fit_segmented_trends(
+            pl.DataFrame({
+                "time_period": pl.Series(years, strict=False),
+                "observed": pl.Series(values, dtype=pl.Float64, strict=False),
+            }),
+            value_col="observed",
+            cutoff_years=[cutoff_year],
+            group_by=[],
+        )
+    else:
+        cutoffs = fit["cutoff_year"].unique()
+        if len(cutoffs) != 1 or fit["time_period"].is_duplicated().any():
+            raise ValueError("fit must contain a single series and cutoff year")
+        if cutoff_year is not None and cutoff_year != cutoffs[0]:
+            raise ValueError(f"cutoff_year {cutoff_year} does not match the fit's cutoff year {cutoffs[0]}")
+        cutoff_year = cutoffs[0]
+
+    years = fit["time_period"].to_list()
+    values = fit["observed"].to_list()
+    line_before = _segment_line(fit, "pre")
+    line_after = _segment_line(fit, "post")
 
     fig, ax = plt.subplots(figsize=(12, 6))
     ax.plot(years, values, "o-", color="grey", alpha=0.5, label="Observed")
 
-    if len(before_y) >= 2:
-        coeffs_before = np.polyfit(before_y, before_v, 1)
-        fit_y = np.array(before_y)
-        fit_v = np.polyval(coeffs_before, fit_y)
-        ax.plot(fit_y, fit_v, "-", color="tab:blue", linewidth=2, label=f"Pre-{cutoff_year} slope: {coeffs_before[0]:+.2f}/yr")
+    if line_before is not None:
+        fit_y, fit_v, slope, _ = line_before
+        ax.plot(fit_y, fit_v, "-", color="tab:blue", linewidth=2, label=f"Pre-{cutoff_year} slope: {slope:+.2f}/yr")
 
-    if len(after_y) >= 2:
-        coeffs_after = np.polyfit(after_y, after_v, 1)
-        fit_y = np.array(after_y)
-        fit_v = np.polyval(coeffs_after, fit_y)
-        ax.plot(fit_y, fit_v, "-", color="tab:red", linewidth=2, label=f"Post-{cutoff_year} slope: {coeffs_after[0]:+.2f}/yr")
+    if line_after is not None:
+        fit_y, fit_v, slope, _ = line_after
+        ax.plot(fit_y, fit_v, "-", color="tab:red", linewidth=2, label=f"Post-{cutoff_year} slope: {slope:+.2f}/yr")
 
     ax.axvline(x=cutoff_year, color="black", linestyle="--", alpha=0.4)
     ax.set_xlabel("Year")
@@ -47,12 +73,14 @@ def plot_segmented_trend(
 
     if print_data:
         print(title)
-        if coeffs_before is not None:
-            print(f"Pre-{cutoff_year} slope: {coeffs_before[0]:+.4f}/yr, intercept: {coeffs_before[1]:.4f}")
-        if coeffs_after is not None:
-            print(f"Post-{cutoff_year} slope: {coeffs_after[0]:+.4f}/yr, intercept: {coeffs_after[1]:.4f}")
-        if coeffs_before is not None and coeffs_after is not None:
-            print(f"Slope change: {coeffs_after[0] - coeffs_before[0]:+.4f}/yr")
+        if line_before is not None:
+            _, _, slope_before, intercept_before = line_before
+            print(f"Pre-{cutoff_year} slope: {slope_before:+.4f}/yr, intercept: {intercept_before:.4f}")
+        if line_after is not None:
+            _, _, slope_after, intercept_after = line_after
+            print(f"Post-{cutoff_year} slope: {slope_after:+.4f}/yr, intercept: {intercept_after:.4f}")
+        if line_before is not None and line_after is not None:
+            print(f"Slope change: {slope_after - slope_before:+.4f}/yr")
         print(f"Year\t{ylabel}")
         for y, v in zip(years, values):
             print(f"{y}\t{v}")
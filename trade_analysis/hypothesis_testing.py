@@ -1,11 +1,6 @@
-import numpy as np
-import polars as pl
-
+from typing import Sequence
 
-def _segment_slope(years: list, values: list) -> float:
-    if len(years) < 2:
-        return float("nan")
-    return float(np.polyfit(years, values, 1)[0])
+import polars as pl
 
 
 def _level_around_cutoff(series: pl.DataFrame, cutoff_year: int, col: str, n: int = 2):
@@ -36,6 +31,69 @@ def _direction(slope_change: float, threshold: float) -> str:
     return "stable"
 
 
+def fit_segmented_trends(
+    df: pl.DataFrame,
+    value_col: str,
+    cutoff_years: Sequence[int] = (2020,),
+    group_by: Sequence[str] = ("product_code", "partner_code"),
+    time_col: str = "time_period",
+) -> pl.DataFrame:
+    # One OLS line per (series, cutoff, segment), fitted in closed form over
+    # all groups at once. Segments with fewer than two points, or with no
+    # spread in years, get null fits. The time column is returned as
+    # "time_period" whatever its input name.
+    keys = [*group_by, "cutoff_year", "segment"]
+    x = pl.col("time_period").cast(pl.Float64)
+    y = pl.col("observed")
+    x_dev = x - x.mean().over(keys)
+    y_dev = y - y.mean().over(keys)
+
+    sxx = (x_dev ** 2).sum().over(keys)
+
+    slope = (
+        pl.when((pl.len().over(keys) >= 2) & (sxx > 0))
+        .then((x_dev * y_dev).sum().over(keys) / sxx)
+    )
+
+    return (
+        df
+        .select(
+            *group_by,
+            pl.col(time_col).alias("time_period"),
+            pl.col(value_col).cast(pl.Float64).alias("observed"),
+        )
+        .drop_nulls("observed")
+        .join(
+            pl.DataFrame({"cutoff_year": list(cutoff_years)}, schema={"cutoff_year": pl.Int64}),
+            how="cross",
+        )
+        .with_columns(
+            pl.when(pl.col("time_period") < pl.col("cutoff_year"))
+            .then(pl.lit("pre"))
+            .otherwise(pl.lit("post"))
+            .alias("segment"),
+        )
+        .with_columns(slope.alias("slope"))
+        .with_columns(
+            (y.mean().over(keys) - pl.col("slope") * x.mean().over(keys)).alias("intercept"),
+        )
+        .with_columns(
+            (pl.col("intercept") + pl.col("slope") * x).alias("fitted"),
+        )
+        .sort(*group_by, "cutoff_year", "time_period")
+    )
+
+
+def _segment_slopes(df: pl.DataFrame, value_col: str, cutoff_year: int) -> dict:
+    # (product_code, "pre" | "post") -> slope, NaN where a segment has no fit.
+    slopes = (
+        fit_segmented_trends(df, value_col, cutoff_years=[cutoff_year], group_by=["product_code"])
+        .group_by("product_code", "segment")
+        .agg(pl.col("slope").first().fill_null(float("nan")))
+    )
+    return {(pc, segment): slope for pc, segment, slope in slopes.iter_rows()}
+
+
 def screen_share_breaks(
     shares_df: pl.DataFrame,
     partner_code: str = "CN",
@@ -49,6 +107,11 @@ def screen_share_breaks(
     )
 
     product_codes = partner_df["product_code"].unique().sort().to_list()
+    slopes = _segment_slopes(
+        partner_df.with_columns((pl.col("share") * 100).alias("share_pct")),
+        "share_pct",
+        cutoff_year,
+    )
     rows = []
 
     for pc in product_codes:
@@ -57,20 +120,8 @@ def screen_share_breaks(
             continue
 
         product_name = series["product_name"][0]
-        shares_pct = (series["share"] * 100).to_list()
-        years = series["time_period"].to_list()
-
-        before_idx = [i for i, y in enumerate(years) if y < cutoff_year]
-        after_idx = [i for i, y in enumerate(years) if y >= cutoff_year]
-
-        slope_before = _segment_slope(
-            [years[i] for i in before_idx],
-            [shares_pct[i] for i in before_idx],
-        )
-        slope_after = _segment_slope(
-            [years[i] for i in after_idx],
-            [shares_pct[i] for i in after_idx],
-        )
+        slope_before = slopes.get((pc, "pre"), float("nan"))
+        slope_after = slopes.get((pc, "post"), float("nan"))
         slope_change = slope_after - slope_before
 
         level_before, level_after = _level_around_cutoff(
@@ -106,6 +157,7 @@ def screen_hhi_breaks(
     threshold: float = 50,
 ) -> pl.DataFrame:
     product_codes = hhi_df["product_code"].unique().sort().to_list()
+    slopes = _segment_slopes(hhi_df, "hhi", cutoff_year)
     rows = []
 
     for pc in product_codes:
@@ -113,20 +165,8 @@ def screen_hhi_breaks(
         if len(series) == 0:
             continue
 
-        hhi_vals = series["hhi"].to_list()
-        years = series["time_period"].to_list()
-
-        before_idx = [i for i, y in enumerate(years) if y < cutoff_year]
-        after_idx = [i for i, y in enumerate(years) if y >= cutoff_year]
-
-        slope_before = _segment_slope(
-            [years[i] for i in before_idx],
-            [hhi_vals[i] for i in before_idx],
-        )
-        slope_after = _segment_slope(
-            [years[i] for i in after_idx],
-            [hhi_vals[i] for i in after_idx],
-        )
+        slope_before = slopes.get((pc, "pre"), float("nan"))
+        slope_after = slopes.get((pc, "post"), float("nan"))
         slope_change = slope_after - slope_before
 
         level_before, level_after = _level_around_cutoff(series, cutoff_year, "hhi")
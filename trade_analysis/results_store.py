@@ -0,0 +1,224 @@
+import hashlib
+import io
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import polars as pl
+
+# Layout: <root>/<kind>/run_id=<run_id>/part-0.parquet
+# Run metadata is stored as constant columns in each file, so filters on it
+# are pruned from the parquet statistics without reading the data pages.
+META_COLUMNS = ["run_id", "run_at", "data_hash", "partner_code", "cutoff_year", "threshold"]
+
+KINDS = ("share_breaks", "hhi_breaks", "breakpoints")
+
+
+def frame_hash(*dfs: pl.DataFrame, batch_size: int = 100_000) -> str:
+    # Rows are sorted first so that frames built by group_by hash the same
+    # across runs; nested columns cannot be sort keys and are left out of it.
+    digest = hashlib.sha256()
+    for df in dfs:
+        digest.update(str(df.schema).encode())
+        sort_cols = [c for c, dtype in df.schema.items() if not dtype.is_nested()]
+        if sort_cols:
+            df = df.sort(sort_cols, maintain_order=True)
+        for batch in df.iter_slices(n_rows=batch_size):
+            buffer = io.BytesIO()
+            batch.write_ipc(buffer, compression="uncompressed")
+            digest.update(buffer.getvalue())
+    return digest.hexdigest()[:16]
+
+
+def _kind_dir(root: Path, kind: str) -> Path:
+    if kind not in KINDS:
+        raise ValueError(f"Unknown result kind {kind!r}, expected one of {KINDS}")
+    return Path(root) / kind
+
+
+def save_run(
+    result_df: pl.DataFrame,
+    root: Path,
+    kind: str,
+    data_hash: str,
+    partner_code: Optional[str] = None,
+    cutoff_year: Optional[int] = None,
+    threshold: Optional[float] = None,
+) -> str:
+    run_at = datetime.now()
+    run_id = f"{run_at:%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+
+    run_dir = _kind_dir(root, kind) / f"run_id={run_id}"
+    run_dir.mkdir(parents=True, exist_ok=False)
+
+    (
+        result_df
+        .with_columns(
+            pl.lit(run_at).alias("run_at"),
+            pl.lit(data_hash).alias("data_hash"),
+            pl.lit(partner_code, dtype=pl.Utf8).alias("partner_code"),
+            pl.lit(cutoff_year, dtype=pl.Int64).alias("cutoff_year"),
+            pl.lit(threshold, dtype=pl.Float64).alias("threshold"),
+        )
+        .write_parquet(run_dir / "part-0.parquet", statistics=True)
+    )
+
+    return run_id
+
+
+def _run_paths(root: Path, kind: str) -> list[Path]:
+    return sorted(_kind_dir(root, kind).glob("run_id=*/*.parquet"))
+
+
+def _has_runs(root: Path, kind: str) -> bool:
+    return len(_run_paths(root, kind)) > 0
+
+
+def _scan_run(root: Path, kind: str, run_id: str) -> pl.LazyFrame:
+    # Reads a single run with its own schema, which may differ from other
+    # runs saved by other code versions.
+    path = _kind_dir(root, kind) / f"run_id={run_id}" / "part-0.parquet"
+    if not path.exists():
+        raise ValueError(f"No {kind} run {run_id!r} in {root}")
+    return pl.scan_parquet(path).drop(META_COLUMNS, strict=False)
+
+
+def scan_runs(root: Path, kind: str) -> pl.LazyFrame:
+    # One scan per run, unioned over all runs' columns: a column that only
+    # some runs have is null for the others. Filters are still pushed down
+    # into each file's scan.
+    return pl.concat(
+        [
+            pl.scan_parquet(path, hive_partitioning=True, hive_schema={"run_id": pl.Utf8})
+            for path in _run_paths(root, kind)
+        ],
+        how="diagonal_relaxed",
+    )
+
+
+def list_runs(root: Path, kind: str) -> pl.DataFrame:
+    if not _has_runs(root, kind):
+        return pl.DataFrame(schema={
+            "run_id": pl.Utf8,
+            "run_at": pl.Datetime("us"),
+            "data_hash": pl.Utf8,
+            "partner_code": pl.Utf8,
+            "cutoff_year": pl.Int64,
+            "threshold": pl.Float64,
+        })
+
+    return (
+        scan_runs(root, kind)
+        .select(META_COLUMNS)
+        .unique()
+        .sort("run_at")
+        .collect()
+    )
+
+
+def load_run(root: Path, kind: str, run_id: str) -> pl.DataFrame:
+    return _scan_run(root, kind, run_id).collect()
+
+
+def latest_run_id(
+    root: Path,
+    kind: str,
+    partner_code: Optional[str] = None,
+    cutoff_year: Optional[int] = None,
+    threshold: Optional[float] = None,
+    data_hash: Optional[str] = None,
+) -> Optional[str]:
+    predicates = [
+        pl.col(name) == value
+        for name, value in [
+            ("partner_code", partner_code),
+            ("cutoff_year", cutoff_year),
+            ("threshold", threshold),
+            ("data_hash", data_hash),
+        ]
+        if value is not None
+    ]
+
+    if not _has_runs(root, kind):
+        return None
+
+    lf = scan_runs(root, kind)
+    if predicates:
+        lf = lf.filter(pl.all_horizontal(predicates))
+
+    latest = (
+        lf
+        .select("run_id", "run_at")
+        .sort("run_at", descending=True)
+        .head(1)
+        .collect()
+    )
+    return latest["run_id"][0] if len(latest) > 0 else None
+
+
+def diff_runs(
+    root: Path,
+    kind: str,
+    run_id_a: str,
+    run_id_b: str,
+    columns: Optional[list[str]] = None,
+    on: str = "product_code",
+) -> pl.DataFrame:
+    run_a = _scan_run(root, kind, run_id_a)
+    run_b = _scan_run(root, kind, run_id_b)
+
+    schema_a = run_a.collect_schema()
+    schema_b = run_b.collect_schema()
+
+    # By default the shared columns are compared; columns only one run has
+    # are still listed, null on the other side, but do not count as changes.
+    if columns is None:
+        columns = [c for c in schema_a.names() if c in schema_b and c not in (on, "product_name")]
+        one_sided = [
+            c for c in [*schema_a.names(), *schema_b.names()]
+            if (c in schema_a) != (c in schema_b) and c != "product_name"
+        ]
+    else:
+        missing = [c for c in columns if c not in schema_a or c not in schema_b]
+        if missing:
+            raise ValueError(f"Columns {missing} are not present in both runs")
+        one_sided = []
+
+    def _select(run: pl.LazyFrame, schema: pl.Schema, other: pl.Schema) -> pl.LazyFrame:
+        return run.select(
+            on,
+            *columns,
+            *[
+                pl.col(c) if c in schema else pl.lit(None, dtype=other[c]).alias(c)
+                for c in one_sided
+            ],
+        )
+
+    joined = (
+        _select(run_a, schema_a, schema_b)
+        .join(
+            _select(run_b, schema_b, schema_a),
+            on=on,
+            how="full",
+            coalesce=True,
+            suffix="_b",
+        )
+        .rename({c: f"{c}_a" for c in [*columns, *one_sided]})
+    )
+
+    return (
+        joined
+        .with_columns(
+            pl.any_horizontal(
+                pl.col(f"{c}_a").ne_missing(pl.col(f"{c}_b")) for c in columns
+            ).alias("changed"),
+        )
+        .select(
+            on,
+            *[name for c in [*columns, *one_sided] for name in (f"{c}_a", f"{c}_b")],
+            "changed",
+        )
+        .sort(on)
+        .collect()
+    )